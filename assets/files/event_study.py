@@ -1,23 +1,200 @@
+import argparse
+import sys
+from functools import lru_cache
+from importlib.util import find_spec
 import numpy as np
 import pandas as pd
-from scipy import stats
+from openpyxl import Workbook
+from numpy.lib.stride_tricks import sliding_window_view
 
-def event_study_analysis_iterative():
+def run_all_numpy(target, reference, min_a, b, c):
+    """
+    Batched OLS over all c estimation windows, then AR and t-stat for each event window
+    Returns slopes, intercepts, std_errs, r_squareds and (c, 2b+1) expected/AR/t-stat matrices
+    """
+    n_est = 30
+
+    # Zero-copy views over every event (2b+1) window
+    ev_ref_all = sliding_window_view(reference, 2 * b + 1)
+    ev_tgt_all = sliding_window_view(target, 2 * b + 1)
+
+    # Centre on the global means so the window variances don't cancel at large levels
+    mr = reference.mean()
+    mt = target.mean()
+    rc = reference - mr
+    tc = target - mt
+
+    # Prefix sums so each 30-day window's sums are a single difference
+    def csum(x):
+        return np.concatenate(([0.0], np.cumsum(x)))
+
+    csum_r = csum(rc)
+    csum_t = csum(tc)
+    csum_r2 = csum(rc * rc)
+    csum_t2 = csum(tc * tc)
+    csum_rt = csum(rc * tc)
+
+    # Batched OLS over all estimation windows at once (one entry per iteration)
+    starts = min_a + np.arange(c) + b + 1
+    ends = starts + n_est
+    sr = csum_r[ends] - csum_r[starts]
+    st = csum_t[ends] - csum_t[starts]
+    sr2 = csum_r2[ends] - csum_r2[starts]
+    st2 = csum_t2[ends] - csum_t2[starts]
+    srt = csum_rt[ends] - csum_rt[starts]
+
+    sxx = sr2 - sr * sr / n_est
+    sxy = srt - sr * st / n_est
+    syy = st2 - st * st / n_est
+
+    slopes = sxy / sxx
+    intercepts = (st - slopes * sr) / n_est + mt - slopes * mr
+    ss_res = np.maximum(syy - slopes * sxy, 0.0)
+    std_errs = np.sqrt(ss_res / ((n_est - 2) * sxx))
+    r_squareds = sxy ** 2 / (sxx * syy)
+
+    # Expected return and AR for every (iteration, event day) pair in one broadcast
+    ev_starts = min_a + np.arange(c) - b
+    Rev = ev_ref_all[ev_starts]
+    Tev = ev_tgt_all[ev_starts]
+    exp_mat = intercepts[:, None] + slopes[:, None] * Rev
+    ar_mat = Tev - exp_mat
+
+    # t-stat as a multiply by 1/SE (0 where SE is 0), so no per-element branch
+    inv_se = np.divide(1.0, std_errs, out=np.zeros_like(std_errs), where=std_errs != 0)
+    tstat_mat = ar_mat * inv_se[:, None]
+
+    return slopes, intercepts, std_errs, r_squareds, exp_mat, ar_mat, tstat_mat
+
+
+def _run_all_loops(target, reference, min_a, b, c):
+    """
+    Explicit-loop equivalent of run_all_numpy, compiled with Numba by get_run_all('numba')
+    """
+    n_est = 30
+    W = 2 * b + 1
+    slopes = np.empty(c)
+    intercepts = np.empty(c)
+    std_errs = np.empty(c)
+    r_squareds = np.empty(c)
+    exp_mat = np.empty((c, W))
+    ar_mat = np.empty((c, W))
+    tstat_mat = np.empty((c, W))
+
+    # Centre on the global means so the window variances don't cancel at large levels
+    mr = reference.mean()
+    mt = target.mean()
+
+    # Window sums for the first estimation window; later windows slide by one day
+    sr = 0.0
+    st = 0.0
+    sr2 = 0.0
+    st2 = 0.0
+    srt = 0.0
+    s0 = min_a + b + 1
+    for j in range(n_est):
+        x = reference[s0 + j] - mr
+        y = target[s0 + j] - mt
+        sr += x
+        st += y
+        sr2 += x * x
+        st2 += y * y
+        srt += x * y
+
+    for k in range(c):
+        a = min_a + k
+
+        if k > 0:
+            # Drop the day that left the window and add the one that entered
+            x_out = reference[a + b] - mr
+            y_out = target[a + b] - mt
+            x_in = reference[a + b + n_est] - mr
+            y_in = target[a + b + n_est] - mt
+            sr += x_in - x_out
+            st += y_in - y_out
+            sr2 += x_in * x_in - x_out * x_out
+            st2 += y_in * y_in - y_out * y_out
+            srt += x_in * y_in - x_out * y_out
+
+        # OLS on the estimation window [a+b+1, a+b+30]
+        sxx = sr2 - sr * sr / n_est
+        sxy = srt - sr * st / n_est
+        syy = st2 - st * st / n_est
+
+        slope = sxy / sxx
+        intercept = (st - slope * sr) / n_est + mt - slope * mr
+        ss_res = max(syy - slope * sxy, 0.0)
+        std_err = np.sqrt(ss_res / ((n_est - 2) * sxx))
+        inv_se = 0.0 if std_err == 0 else 1.0 / std_err
+
+        slopes[k] = slope
+        intercepts[k] = intercept
+        std_errs[k] = std_err
+        r_squareds[k] = sxy * sxy / (sxx * syy)
+
+        # AR and t-stat over the event window [a-b, a+b]
+        for j in range(W):
+            i = a - b + j
+            expected = intercept + slope * reference[i]
+            ar = target[i] - expected
+            exp_mat[k, j] = expected
+            ar_mat[k, j] = ar
+            tstat_mat[k, j] = ar * inv_se
+
+    return slopes, intercepts, std_errs, r_squareds, exp_mat, ar_mat, tstat_mat
+
+
+KERNELS = ('numpy', 'numba', 'cython')
+
+
+@lru_cache(maxsize=None)
+def get_run_all(kernel='numpy'):
+    """
+    Return the run_all implementation for kernel: 'numpy' (default), 'numba' or 'cython'
+    The compiled kernels are opt-in; raises ImportError if numba or the built
+    event_study_kernel extension (python setup.py build_ext --inplace) is missing
+    """
+    if kernel == 'numpy':
+        return run_all_numpy
+    if kernel == 'numba':
+        from numba import njit
+        return njit(cache=True, fastmath=True)(_run_all_loops)
+    if kernel == 'cython':
+        import event_study_kernel
+        return event_study_kernel.run_all
+    raise ValueError(f"Unknown kernel '{kernel}', expected one of {KERNELS}")
+
+
+def event_study_analysis_iterative(verbose=False, kernel='numpy'):
     """
     Iterative Event Study Analysis Code
     Reads data from data.xlsx and calculates AR for multiple event pointers
+    Per-iteration output is only printed when verbose is True
+    kernel selects the run_all implementation (see get_run_all)
     """
 
-    print("=" * 60)
-    print("ITERATIVE EVENT STUDY ANALYSIS")
-    print("=" * 60)
+    try:
+        run_all = get_run_all(kernel)
+    except ImportError as e:
+        print(f"\nERROR: Kernel '{kernel}' is not available - {e}")
+        return None
+
+    log = print if verbose else (lambda *args, **kwargs: None)
+
+    log("=" * 60)
+    log("ITERATIVE EVENT STUDY ANALYSIS")
+    log("=" * 60)
 
     # Read data from Excel file
     try:
-        df = pd.read_excel('data.xlsx')
-        print(f"\n✓ Successfully loaded data.xlsx")
-        print(f"  Rows: {len(df)}")
-        print(f"  Columns: {list(df.columns)}")
+        # Only the two return columns are needed; calamine parses much faster than openpyxl
+        df = pd.read_excel('data.xlsx',
+                           usecols=['target_index', 'reference_index'],
+                           dtype=np.float64,
+                           engine='calamine' if find_spec('python_calamine') else 'openpyxl')
+        log(f"\n✓ Successfully loaded data.xlsx")
+        log(f"  Rows: {len(df)}")
+        log(f"  Columns: {list(df.columns)}")
     except FileNotFoundError:
         print("\nERROR: data.xlsx not found in the current directory!")
         print("Please ensure data.xlsx is in the same folder as this script.")
@@ -27,15 +204,17 @@ def event_study_analysis_iterative():
         return None
 
     # Extract arrays (remove NaN values if any)
-    target_index = df['target_index'].dropna().values
-    reference_index = df['reference_index'].dropna().values
+    target_index = df['target_index'].to_numpy()
+    reference_index = df['reference_index'].to_numpy()
+    target_index = target_index[~np.isnan(target_index)]
+    reference_index = reference_index[~np.isnan(reference_index)]
 
     # Ensure both arrays have the same length
     n = min(len(target_index), len(reference_index))
     target_index = target_index[:n]
     reference_index = reference_index[:n]
 
-    print(f"\n  Valid data points: {n}")
+    log(f"\n  Valid data points: {n}")
 
     # Input: Parameters
     print("\n" + "=" * 60)
@@ -52,10 +231,14 @@ def event_study_analysis_iterative():
         print(f"       Data size too small or b too large.")
         return None
 
-    print(f"\nValid range for 'a': [{min_a}, {max_a}]")
-    print(f"Starting 'a' at: {min_a}")
-    print(f"Number of iterations: {c}")
-    print(f"Ending 'a' at: {min_a + c - 1}")
+    if c < 1:
+        print(f"\nERROR: Number of iterations 'c' must be at least 1, got {c}")
+        return None
+
+    log(f"\nValid range for 'a': [{min_a}, {max_a}]")
+    log(f"Starting 'a' at: {min_a}")
+    log(f"Number of iterations: {c}")
+    log(f"Ending 'a' at: {min_a + c - 1}")
 
     if min_a + c - 1 > max_a:
         print(f"\nWARNING: Some iterations will exceed valid range!")
@@ -63,88 +246,77 @@ def event_study_analysis_iterative():
         c = max_a - min_a + 1
         print(f"         Adjusted to {c} iterations.")
 
-    # Store all results
-    all_results = []
-    all_regression_params = []
-
-    # Iterate through different values of 'a'
-    for iteration in range(c):
-        a = min_a + iteration
-
-        print("\n" + "=" * 80)
-        print(f"ITERATION {iteration + 1}/{c} | Event Pointer a = {a}")
-        print("=" * 80)
-
-        # Define windows
-        event_window_start = a - b
-        event_window_end = a + b
-        estimation_window_start = a + b + 1
-        estimation_window_end = a + b + 30
-
-        print(f"Event Window: [{event_window_start}, {event_window_end}]")
-        print(f"Estimation Window: [{estimation_window_start}, {estimation_window_end}]")
-
-        # Extract estimation window data
-        est_target = target_index[estimation_window_start:estimation_window_end + 1]
-        est_reference = reference_index[estimation_window_start:estimation_window_end + 1]
-
-        # Perform Linear Regression (OLS) on estimation window
-        slope, intercept, r_value, p_value, std_err = stats.linregress(est_reference, est_target)
-        r_squared = r_value ** 2
-
-        print(f"\nRegression: α={intercept:.6f}, β={slope:.6f}, SE={std_err:.6f}, R²={r_squared:.6f}")
-
-        # Store regression parameters
-        all_regression_params.append({
-            'iteration': iteration + 1,
-            'a': a,
-            'b': b,
-            'intercept': intercept,
-            'slope': slope,
-            'std_err': std_err,
-            'r_squared': r_squared
+    # Regression and AR/t-stat for every iteration in one batched call
+    slopes, intercepts, std_errs, r_squareds, exp_mat, ar_mat, tstat_mat = run_all(
+        target_index, reference_index, min_a, b, c)
+
+    # Event-window data for every iteration, one row per iteration
+    W = 2 * b + 1
+    a_values = min_a + np.arange(c)
+    ev_ref = sliding_window_view(reference_index, W)[a_values - b]
+    ev_tgt = sliding_window_view(target_index, W)[a_values - b]
+    ev_idx = (a_values - b)[:, None] + np.arange(W)
+
+    # Result columns for all iterations x event days, flattened iteration by iteration
+    all_results = {
+        'iteration': np.repeat(np.arange(1, c + 1), W),
+        'a': np.repeat(a_values, W),
+        'b': np.full(c * W, b),
+        'index': ev_idx.ravel(),
+        'target': ev_tgt.ravel(),
+        'reference': ev_ref.ravel(),
+        'expected': exp_mat.ravel(),
+        'ar': ar_mat.ravel(),
+        't_stat': tstat_mat.ravel()
+    }
+    all_regression_params = {
+        'iteration': np.arange(1, c + 1),
+        'a': a_values,
+        'b': np.full(c, b),
+        'intercept': intercepts,
+        'slope': slopes,
+        'std_err': std_errs,
+        'r_squared': r_squareds
+    }
+
+    def report(iteration):
+        """Format the regression and AR table of one iteration as report lines"""
+        a = a_values[iteration]
+        slope = slopes[iteration]
+        intercept = intercepts[iteration]
+        std_err = std_errs[iteration]
+        r_squared = r_squareds[iteration]
+        ar = ar_mat[iteration]
+
+        ar_results = pd.DataFrame({
+            'index': ev_idx[iteration],
+            'target': ev_tgt[iteration],
+            'reference': ev_ref[iteration],
+            'expected': exp_mat[iteration],
+            'ar': ar,
+            't_stat': tstat_mat[iteration]
         })
 
-        # Calculate AR and t-stat for each point in event window
-        print(f"\n{'Index':<8} {'Target':<12} {'Reference':<12} {'Expected':<12} {'AR':<12} {'t-stat':<12}")
-        print("-" * 80)
-
-        ar_list = []
-
-        for i in range(event_window_start, event_window_end + 1):
-            target_return = target_index[i]
-            reference_return = reference_index[i]
-
-            # Expected return based on regression model
-            expected_return = intercept + (slope * reference_return)
-
-            # Abnormal Return
-            ar = target_return - expected_return
-
-            # t-statistic
-            t_stat = ar / std_err if std_err != 0 else 0
-
-            all_results.append({
-                'iteration': iteration + 1,
-                'a': a,
-                'b': b,
-                'index': i,
-                'target': target_return,
-                'reference': reference_return,
-                'expected': expected_return,
-                'ar': ar,
-                't_stat': t_stat
-            })
-
-            ar_list.append(ar)
-
-            print(f"{i:<8} {target_return:<12.6f} {reference_return:<12.6f} {expected_return:<12.6f} {ar:<12.6f} {t_stat:<12.6f}")
-
         # Calculate CAR and AAR
-        car = sum(ar_list)
-        aar = car / len(ar_list)
-
-        print(f"\nCAR: {car:.6f} | AAR: {aar:.6f}")
+        car = float(ar.sum())
+        aar = car / ar.size
+
+        return [
+            "\n" + "=" * 80,
+            f"ITERATION {iteration + 1}/{c} | Event Pointer a = {a}",
+            "=" * 80,
+            f"Event Window: [{a - b}, {a + b}]",
+            f"Estimation Window: [{a + b + 1}, {a + b + 30}]",
+            f"\nRegression: α={intercept:.6f}, β={slope:.6f}, SE={std_err:.6f}, R²={r_squared:.6f}",
+            "",
+            ar_results.to_string(index=False, float_format='{:.6f}'.format),
+            f"\nCAR: {car:.6f} | AAR: {aar:.6f}"
+        ]
+
+    # Only the verbose report needs per-iteration work
+    if verbose:
+        lines = [line for i in range(c) for line in report(i)]
+        sys.stdout.write("\n".join(lines) + "\n")
 
     print("\n" + "=" * 80)
     print("ALL ITERATIONS COMPLETED")
@@ -153,9 +325,30 @@ def event_study_analysis_iterative():
     return all_results, all_regression_params
 
 
+def save_results_excel(filename, sheets):
+    """
+    Save DataFrames to an Excel file, one sheet per entry in sheets
+    Uses an openpyxl write-only workbook so rows are streamed to disk
+    """
+    wb = Workbook(write_only=True)
+    for sheet_name, df in sheets.items():
+        ws = wb.create_sheet(sheet_name)
+        ws.append(list(df.columns))
+        for row in df.itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(filename)
+
+
 # Run the analysis
 if __name__ == "__main__":
-    results = event_study_analysis_iterative()
+    parser = argparse.ArgumentParser(description="Iterative event study on data.xlsx")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="print regression and AR tables for every iteration")
+    parser.add_argument('--kernel', choices=KERNELS, default='numpy',
+                        help="regression kernel; numba and cython are optional compiled versions")
+    args = parser.parse_args()
+
+    results = event_study_analysis_iterative(verbose=args.verbose, kernel=args.kernel)
 
     # Save results to file
     if results is not None:
@@ -167,12 +360,13 @@ if __name__ == "__main__":
 
         # Save to Excel with multiple sheets
         filename = "event_study_results_iterative.xlsx"
-        with pd.ExcelWriter(filename) as writer:
-            df_results.to_excel(writer, sheet_name='AR_Results', index=False)
-            df_params.to_excel(writer, sheet_name='Regression_Params', index=False)
+        save_results_excel(filename, {
+            'AR_Results': df_results,
+            'Regression_Params': df_params
+        })
 
         print(f"\n✓ Results saved to {filename}")
         print(f"  - Sheet 'AR_Results': All AR and t-statistics for all iterations")
         print(f"  - Sheet 'Regression_Params': Regression parameters for each iteration")
-        print(f"  - Total iterations: {len(all_regression_params)}")
-        print(f"  - Total AR calculations: {len(all_results)}")
+        print(f"  - Total iterations: {len(df_params)}")
+        print(f"  - Total AR calculations: {len(df_results)}")
@@ -0,0 +1,139 @@
+"""
+Compiled Event Study Kernel
+30-point OLS and event-window AR/t-stat over typed memoryviews
+Build with: python setup.py build_ext --inplace
+"""
+from libc.math cimport sqrt
+import numpy as np
+
+cdef enum:
+    N_EST = 30
+
+
+cdef void ols30(const double* x, const double* y, double* out) noexcept nogil:
+    """
+    OLS of y on x over 30 points, using centred sums so large levels don't cancel
+    Writes slope, intercept, std_err, r_squared to out[0..3]
+    """
+    cdef double xm = 0.0, ym = 0.0, vxx = 0.0, vxy = 0.0, vyy = 0.0
+    cdef double dx, dy, slope, ss_res
+    cdef int j
+
+    for j in range(N_EST):
+        xm += x[j]
+        ym += y[j]
+    xm /= N_EST
+    ym /= N_EST
+
+    for j in range(N_EST):
+        dx = x[j] - xm
+        dy = y[j] - ym
+        vxx += dx * dx
+        vxy += dx * dy
+        vyy += dy * dy
+
+    slope = vxy / vxx
+    ss_res = vyy - slope * vxy
+    if ss_res < 0:
+        ss_res = 0.0
+    out[0] = slope
+    out[1] = ym - slope * xm
+    out[2] = sqrt(ss_res / ((N_EST - 2) * vxx))
+    out[3] = vxy * vxy / (vxx * vyy)
+
+
+cdef void ar_event(const double* tx, const double* rx, double intercept, double slope,
+                   double se, double* exp_out, double* ar_out, double* t_out,
+                   int n) noexcept nogil:
+    """
+    Expected return, abnormal return and t-stat for n event-window days
+    """
+    cdef int j
+    cdef double expected, ar
+    cdef double inv_se = 0.0 if se == 0 else 1.0 / se
+
+    for j in range(n):
+        expected = intercept + slope * rx[j]
+        ar = tx[j] - expected
+        exp_out[j] = expected
+        ar_out[j] = ar
+        t_out[j] = ar * inv_se
+
+
+def ols30_window(x, y):
+    """
+    Python wrapper for ols30; returns slope, intercept, std_err, r_squared
+    """
+    cdef double[::1] xv = np.ascontiguousarray(x, dtype=np.float64)
+    cdef double[::1] yv = np.ascontiguousarray(y, dtype=np.float64)
+    cdef double out[4]
+
+    if xv.shape[0] != N_EST or yv.shape[0] != N_EST:
+        raise ValueError(f"ols30_window expects {N_EST} points")
+
+    ols30(&xv[0], &yv[0], out)
+    return out[0], out[1], out[2], out[3]
+
+
+def abnormal_returns(tx, rx, double intercept, double slope, double se):
+    """
+    Python wrapper for ar_event; returns expected, AR and t-stat arrays
+    """
+    cdef double[::1] tv = np.ascontiguousarray(tx, dtype=np.float64)
+    cdef double[::1] rv = np.ascontiguousarray(rx, dtype=np.float64)
+    cdef Py_ssize_t n = tv.shape[0]
+    expected = np.empty(n)
+    ar = np.empty(n)
+    t_stat = np.empty(n)
+    cdef double[::1] exp_v = expected
+    cdef double[::1] ar_v = ar
+    cdef double[::1] t_v = t_stat
+
+    if n > 0:
+        ar_event(&tv[0], &rv[0], intercept, slope, se, &exp_v[0], &ar_v[0], &t_v[0], <int>n)
+    return expected, ar, t_stat
+
+
+def run_all(target, reference, Py_ssize_t min_a, Py_ssize_t b, Py_ssize_t c):
+    """
+    Compiled equivalent of run_all_numpy in event_study.py
+    Returns slopes, intercepts, std_errs, r_squareds and (c, 2b+1) expected/AR/t-stat matrices
+    """
+    cdef double[::1] t = np.ascontiguousarray(target, dtype=np.float64)
+    cdef double[::1] r = np.ascontiguousarray(reference, dtype=np.float64)
+    cdef Py_ssize_t W = 2 * b + 1
+    cdef Py_ssize_t k, a
+
+    slopes = np.empty(c)
+    intercepts = np.empty(c)
+    std_errs = np.empty(c)
+    r_squareds = np.empty(c)
+    exp_mat = np.empty((c, W))
+    ar_mat = np.empty((c, W))
+    tstat_mat = np.empty((c, W))
+
+    cdef double[::1] slopes_v = slopes
+    cdef double[::1] intercepts_v = intercepts
+    cdef double[::1] std_errs_v = std_errs
+    cdef double[::1] r_squareds_v = r_squareds
+    cdef double[:, ::1] exp_v = exp_mat
+    cdef double[:, ::1] ar_v = ar_mat
+    cdef double[:, ::1] t_v = tstat_mat
+    cdef double out[4]
+
+    with nogil:
+        for k in range(c):
+            a = min_a + k
+
+            # OLS on the estimation window [a+b+1, a+b+30]
+            ols30(&r[a + b + 1], &t[a + b + 1], out)
+            slopes_v[k] = out[0]
+            intercepts_v[k] = out[1]
+            std_errs_v[k] = out[2]
+            r_squareds_v[k] = out[3]
+
+            # AR and t-stat over the event window [a-b, a+b]
+            ar_event(&t[a - b], &r[a - b], out[1], out[0], out[2],
+                     &exp_v[k, 0], &ar_v[k, 0], &t_v[k, 0], <int>W)
+
+    return slopes, intercepts, std_errs, r_squareds, exp_mat, ar_mat, tstat_mat
@@ -1,12 +1,72 @@
+import argparse
+import math
+import sys
 import numpy as np
-from scipy import stats
+import pandas as pd
 
-def event_study_analysis():
+def ols30(x, y):
+    """
+    Closed-form simple OLS of y on x (used on the 30-day estimation window)
+    Returns slope, intercept, standard error of the slope and R-squared
+    """
+    xm = x.mean()
+    ym = y.mean()
+    dx = x - xm
+    dy = y - ym
+    sxx = (dx * dx).sum()
+    sxy = (dx * dy).sum()
+    slope = sxy / sxx
+    intercept = ym - slope * xm
+    res = dy - slope * dx
+    ss_res = (res * res).sum()
+    std_err = math.sqrt(ss_res / ((len(x) - 2) * sxx))
+    r_squared = sxy * sxy / (sxx * (dy * dy).sum())
+    return slope, intercept, std_err, r_squared
+
+
+def abnormal_returns(tgt, ref, intercept, slope, std_err):
+    """
+    Expected return, AR and t-stat for each event-window day
+    """
+    expected = intercept + slope * ref
+    ar = tgt - expected
+    inv_se = 0.0 if std_err == 0 else 1.0 / std_err
+    return expected, ar, ar * inv_se
+
+
+KERNELS = ('numpy', 'cython')
+
+
+def get_kernel(kernel='numpy'):
+    """
+    Return the (ols, abnormal_returns) pair for kernel: 'numpy' (default) or 'cython'
+    The Cython kernel is opt-in; raises ImportError if the event_study_kernel
+    extension has not been built (python setup.py build_ext --inplace)
+    """
+    if kernel == 'numpy':
+        return ols30, abnormal_returns
+    if kernel == 'cython':
+        import event_study_kernel
+        return event_study_kernel.ols30_window, event_study_kernel.abnormal_returns
+    raise ValueError(f"Unknown kernel '{kernel}', expected one of {KERNELS}")
+
+
+def event_study_analysis(verbose=False, kernel='numpy'):
     """
     Event Study Analysis Code
     Calculates AR (Abnormal Returns) and t-statistics for an event window
+    Regression and AR tables are only printed when verbose is True
+    kernel selects the OLS/AR implementation (see get_kernel)
     """
 
+    try:
+        ols, ar_kernel = get_kernel(kernel)
+    except ImportError as e:
+        print(f"\nERROR: Kernel '{kernel}' is not available - {e}")
+        return None
+
+    log = print if verbose else (lambda *args, **kwargs: None)
+
     # Get user inputs
     print("=" * 60)
     print("EVENT STUDY ANALYSIS")
@@ -15,21 +75,20 @@ def event_study_analysis():
     # Input: Size of arrays
     n = int(input("\nEnter the size of arrays (n): "))
 
-    # Input: Target index returns
-    print(f"\nEnter {n} values for TARGET_INDEX returns:")
-    target_index = []
-    for i in range(n):
-        val = float(input(f"  Target_index[{i}]: "))
-        target_index.append(val)
-    target_index = np.array(target_index)
-
-    # Input: Reference index returns
-    print(f"\nEnter {n} values for REFERENCE_INDEX returns:")
-    reference_index = []
-    for i in range(n):
-        val = float(input(f"  Reference_index[{i}]: "))
-        reference_index.append(val)
-    reference_index = np.array(reference_index)
+    # Input: Target and reference index returns, one line each
+    try:
+        target_index = np.fromstring(
+            input(f"\nEnter {n} TARGET_INDEX returns (space or comma separated): ").replace(',', ' '), sep=' ')
+        reference_index = np.fromstring(
+            input(f"Enter {n} REFERENCE_INDEX returns (space or comma separated): ").replace(',', ' '), sep=' ')
+    except ValueError:
+        print(f"\nERROR: Expected {n} numeric values for each index")
+        return None
+
+    if len(target_index) != n or len(reference_index) != n:
+        print(f"\nERROR: Expected {n} values for each index, got "
+              f"{len(target_index)} target and {len(reference_index)} reference")
+        return None
 
     # Input: Event parameters
     print("\n" + "=" * 60)
@@ -43,8 +102,8 @@ def event_study_analysis():
     estimation_window_start = a + b + 1
     estimation_window_end = a + b + 30
 
-    print(f"\nEvent Window: [{event_window_start}, {event_window_end}]")
-    print(f"Estimation Window: [{estimation_window_start}, {estimation_window_end}]")
+    log(f"\nEvent Window: [{event_window_start}, {event_window_end}]")
+    log(f"Estimation Window: [{estimation_window_start}, {estimation_window_end}]")
 
     # Validate indices
     if event_window_start < 0 or estimation_window_end >= n:
@@ -57,56 +116,45 @@ def event_study_analysis():
 
     # Perform Linear Regression (OLS) on estimation window
     # target = intercept + slope * reference
-    slope, intercept, r_value, p_value, std_err = stats.linregress(est_reference, est_target)
-    r_squared = r_value ** 2
-
-    print("\n" + "=" * 60)
-    print("REGRESSION RESULTS (Estimation Window)")
-    print("=" * 60)
-    print(f"Intercept (α): {intercept:.6f}")
-    print(f"Slope (β): {slope:.6f}")
-    print(f"Standard Error: {std_err:.6f}")
-    print(f"R-squared: {r_squared:.6f}")
-    print("=" * 60)
-
-    # Calculate AR and t-stat for each point in event window
-    print("\n" + "=" * 60)
-    print("ABNORMAL RETURNS (AR) AND T-STATISTICS")
-    print("=" * 60)
-    print(f"{'Index':<8} {'Target':<12} {'Reference':<12} {'Expected':<12} {'AR':<12} {'t-stat':<12}")
-    print("-" * 80)
-
-    ar_results = []
-
-    for i in range(event_window_start, event_window_end + 1):
-        target_return = target_index[i]
-        reference_return = reference_index[i]
-
-        # Expected return based on regression model
-        expected_return = intercept + (slope * reference_return)
-
-        # Abnormal Return
-        ar = target_return - expected_return
-
-        # t-statistic
-        t_stat = ar / std_err if std_err != 0 else 0
-
-        ar_results.append({
-            'index': i,
-            'target': target_return,
-            'reference': reference_return,
-            'expected': expected_return,
-            'ar': ar,
-            't_stat': t_stat
-        })
-
-        print(f"{i:<8} {target_return:<12.6f} {reference_return:<12.6f} {expected_return:<12.6f} {ar:<12.6f} {t_stat:<12.6f}")
-
-    print("=" * 60)
+    slope, intercept, std_err, r_squared = ols(est_reference, est_target)
+
+    log("\n" + "=" * 60)
+    log("REGRESSION RESULTS (Estimation Window)")
+    log("=" * 60)
+    log(f"Intercept (α): {intercept:.6f}")
+    log(f"Slope (β): {slope:.6f}")
+    log(f"Standard Error: {std_err:.6f}")
+    log(f"R-squared: {r_squared:.6f}")
+    log("=" * 60)
+
+    # Vectorized expected return, AR and t-stat over the whole event window
+    idx = np.arange(event_window_start, event_window_end + 1)
+    tgt = target_index[idx]
+    ref = reference_index[idx]
+    expected, ar, t_stat = ar_kernel(tgt, ref, intercept, slope, std_err)
+
+    ar_results = pd.DataFrame({
+        'index': idx,
+        'target': tgt,
+        'reference': ref,
+        'expected': expected,
+        'ar': ar,
+        't_stat': t_stat
+    })
+
+    # Emit the whole AR table with a single write
+    if verbose:
+        sys.stdout.write("\n".join([
+            "\n" + "=" * 60,
+            "ABNORMAL RETURNS (AR) AND T-STATISTICS",
+            "=" * 60,
+            ar_results.to_string(index=False, float_format='{:.6f}'.format),
+            "=" * 60,
+        ]) + "\n")
 
     # Calculate Cumulative Abnormal Return (CAR)
-    total_ar = sum([result['ar'] for result in ar_results])
-    avg_ar = total_ar / len(ar_results)
+    total_ar = float(ar.sum())
+    avg_ar = float(ar.mean())
 
     print(f"\nCumulative Abnormal Return (CAR): {total_ar:.6f}")
     print(f"Average Abnormal Return (AAR): {avg_ar:.6f}")
@@ -117,13 +165,19 @@ def event_study_analysis():
 
 # Run the analysis
 if __name__ == "__main__":
-    results = event_study_analysis()
+    parser = argparse.ArgumentParser(description="Single event study from entered returns")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="print regression results and the AR table")
+    parser.add_argument('--kernel', choices=KERNELS, default='numpy',
+                        help="OLS/AR kernel; cython is an optional compiled version")
+    args = parser.parse_args()
+
+    results = event_study_analysis(verbose=args.verbose, kernel=args.kernel)
 
     # Optional: Save results to file
     if results is not None:
         save = input("\nDo you want to save results to CSV? (y/n): ")
         if save.lower() == 'y':
-            import pandas as pd
             ar_results, intercept, slope, std_err, r_squared = results
             df = pd.DataFrame(ar_results)
             filename = "event_study_results.csv"
@@ -0,0 +1,27 @@
+"""
+Build the optional Cython event study kernel in place
+Usage: python setup.py build_ext --inplace
+Set EVENT_STUDY_AVX2=1 to compile with -mavx2 (the build then only runs on AVX2 CPUs)
+"""
+import os
+
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+extra_compile_args = ['-O3', '-ffast-math']
+if os.environ.get('EVENT_STUDY_AVX2') == '1':
+    extra_compile_args.append('-mavx2')
+
+setup(
+    name='event_study_kernel',
+    ext_modules=cythonize(
+        Extension('event_study_kernel', ['event_study_kernel.pyx'],
+                  extra_compile_args=extra_compile_args),
+        compiler_directives={
+            'boundscheck': False,
+            'wraparound': False,
+            'cdivision': True,
+            'language_level': 3
+        }
+    )
+)
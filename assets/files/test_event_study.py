@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import event_study
+
+OUTPUT_NAMES = ['slopes', 'intercepts', 'std_errs', 'r_squareds', 'expected', 'ar', 't_stat']
+KERNEL_MODULES = {'numba': 'numba', 'cython': 'event_study_kernel'}
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    reference = rng.normal(scale=0.02, size=400)
+    target = 0.8 * reference + rng.normal(scale=0.01, size=400)
+    return target, reference
+
+
+@pytest.mark.parametrize('kernel', ['numba', 'cython'])
+def test_compiled_kernel_matches_numpy(kernel, series):
+    pytest.importorskip(KERNEL_MODULES[kernel])
+    target, reference = series
+
+    expected = event_study.run_all_numpy(target, reference, 5, 5, 300)
+    actual = event_study.get_run_all(kernel)(target, reference, 5, 5, 300)
+
+    for name, want, got in zip(OUTPUT_NAMES, expected, actual):
+        np.testing.assert_allclose(got, want, rtol=1e-9, atol=1e-12, err_msg=name)
+
+
+def test_numpy_kernel_matches_linregress(series):
+    stats = pytest.importorskip('scipy.stats')
+    target, reference = series
+    target = target + 1e5
+    reference = reference + 1e5
+
+    slopes, intercepts, std_errs, r_squareds = event_study.run_all_numpy(
+        target, reference, 5, 5, 300)[:4]
+
+    for k in range(300):
+        start = 5 + k + 5 + 1
+        fit = stats.linregress(reference[start:start + 30], target[start:start + 30])
+        np.testing.assert_allclose(
+            [slopes[k], intercepts[k], std_errs[k], r_squareds[k]],
+            [fit.slope, fit.intercept, fit.stderr, fit.rvalue ** 2], rtol=1e-6)
+
+
+@pytest.mark.parametrize('c', [0, -3])
+def test_non_positive_iterations_are_rejected(c, monkeypatch, capsys):
+    pytest.importorskip('openpyxl')
+    monkeypatch.chdir(Path(__file__).parent)
+    answers = iter(['3', str(c)])
+    monkeypatch.setattr('builtins.input', lambda prompt='': next(answers))
+
+    assert event_study.event_study_analysis_iterative() is None
+    assert "ERROR: Number of iterations 'c' must be at least 1" in capsys.readouterr().out